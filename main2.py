@@ -1,23 +1,33 @@
+import time
+_IMPORT_START = time.perf_counter()
+
+import os
+import sys
+import base64
+import logging
 import streamlit as st
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import requests
-from PIL import Image
 from io import BytesIO
 import random
+import startup
+
+# sklearn, requests and PIL are imported lazily inside the functions that use them;
+# tests/test_startup.py enforces this and the budget below
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+IMPORT_BUDGET_SECONDS = 2.0
+
+logger = logging.getLogger(__name__)
 
-# ========================= PAGE CONFIGURATION =========================
-st.set_page_config(
-    page_title="FilmyX AI - Smart Movie Recommendations",
-    page_icon="🎬",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Port of the HTTP readiness probe started by `python main2.py serve`
+READY_PORT = int(os.environ.get("FILMYX_READY_PORT", "8502"))
+
+# Number of top-rated movies on the home grid, also used as warm-up seeds
+HOME_GRID_SIZE = 9
+DEFAULT_MIN_RATING = 7.5
 
 # ========================= CUSTOM CSS STYLING =========================
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     /* Global Styles */
     .stApp {
@@ -175,7 +185,7 @@ st.markdown("""
         box-shadow: 0 5px 15px rgba(233, 69, 96, 0.4);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 # ========================= DATA LOADING =========================
 
@@ -347,17 +357,13 @@ def load_movie_data():
 
 @st.cache_resource
 def create_similarity_matrix(movies):
-    """Create TF-IDF matrix and calculate cosine similarity"""
-    tfidf = TfidfVectorizer(
-        stop_words='english',
-        ngram_range=(1, 2),
-        max_features=5000
-    )
-    
-    tfidf_matrix = tfidf.fit_transform(movies['features'])
-    cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
-    
-    return cosine_sim
+    """Load the prebuilt similarity index, fitting TF-IDF only on a miss"""
+    return startup.get_similarity_matrix(movies['features'])
+
+@st.cache_data(show_spinner=False, max_entries=256, ttl=3600)
+def fetch_poster(poster_url):
+    """Poster bytes from the startup disk cache; failures raise and are not cached"""
+    return startup.fetch_poster(poster_url)
 
 # ========================= RECOMMENDATION ENGINE =========================
 
@@ -405,15 +411,61 @@ def get_recommendations(movie_title, movies, cosine_sim, filters, n_recommendati
     else:
         return pd.DataFrame()
 
+# ========================= WARM START =========================
+
+def default_filters(movies):
+    """Filters matching the sidebar defaults"""
+    return {
+        'year_range': (int(movies['year'].min()), int(movies['year'].max())),
+        'min_rating': DEFAULT_MIN_RATING,
+        'selected_genres': []
+    }
+
+def warm_up_poster_urls(movies, cosine_sim):
+    """Posters of the home grid seeds and their default-filter recommendations"""
+    seeds = movies.nlargest(HOME_GRID_SIZE, 'rating')
+    filters = default_filters(movies)
+    poster_urls = set(seeds['poster_url'])
+    for title in seeds['title']:
+        recommendations = get_recommendations(title, movies, cosine_sim, filters)
+        if len(recommendations) > 0:
+            poster_urls.update(recommendations['poster_url'])
+    return poster_urls
+
+def warm_up_caches(movies):
+    """Load the similarity index and prefetch posters; returns the number of posters warmed"""
+    cosine_sim = startup.get_similarity_matrix(movies['features'])
+    return startup.prefetch_posters(warm_up_poster_urls(movies, cosine_sim))
+
+def format_startup_report(state):
+    """One-line summary of startup timings"""
+    report = f"imports {state['import_seconds']:.2f}s (budget {IMPORT_BUDGET_SECONDS:.1f}s)"
+    if state['warm_seconds'] is not None:
+        report += f" | warm-up {state['warm_seconds']:.2f}s, {state['warmed_posters']} posters"
+    else:
+        report += f" | warm-up {state['status']}"
+    if state['seconds_to_ready'] is not None:
+        report += f" | ready after {state['seconds_to_ready']:.2f}s"
+    if state['time_to_first_response'] is not None:
+        report += f" | first response {state['time_to_first_response']:.2f}s"
+    return report
+
 # ========================= UI COMPONENTS =========================
 
+def poster_src(poster_url):
+    """Inline data URI for a cached poster, else the remote URL for the browser to load"""
+    poster = startup.cached_poster(poster_url)
+    if poster is None:
+        return poster_url
+    return "data:image/jpeg;base64," + base64.b64encode(poster).decode('ascii')
+
 def display_movie_card(movie, show_similarity=False, compact=False):
     """Display movie card with poster and information"""
     if compact:
         # Compact view for grid display
         st.markdown(f"""
         <div class="movie-card">
-            <img src="{movie['poster_url']}" style="width:100%; border-radius:10px; margin-bottom:10px;">
+            <img src="{poster_src(movie['poster_url'])}" style="width:100%; border-radius:10px; margin-bottom:10px;">
             <div class="movie-title">{movie['title']}</div>
             <div class="movie-info">⭐ {movie['rating']} | 📅 {movie['year']}</div>
         """, unsafe_allow_html=True)
@@ -429,8 +481,9 @@ def display_movie_card(movie, show_similarity=False, compact=False):
         
         with col1:
             try:
-                response = requests.get(movie['poster_url'], timeout=5)
-                img = Image.open(BytesIO(response.content))
+                from PIL import Image
+
+                img = Image.open(BytesIO(fetch_poster(movie['poster_url'])))
                 st.image(img, use_container_width=True)
             except:
                 st.image("https://via.placeholder.com/300x450?text=No+Image", use_container_width=True)
@@ -466,10 +519,22 @@ def display_movie_card(movie, show_similarity=False, compact=False):
 # ========================= MAIN APPLICATION =========================
 
 def main():
+    # ========================= PAGE CONFIGURATION =========================
+    st.set_page_config(
+        page_title="FilmyX AI - Smart Movie Recommendations",
+        page_icon="🎬",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    
     # Load data
     movies = load_movie_data()
     cosine_sim = create_similarity_matrix(movies)
     
+    # No-op when `python main2.py serve` or an earlier session already started it
+    startup.start_warm_up(warm_up_caches, movies)
+    
     # Extract all unique genres
     all_genres = set()
     for genres_str in movies['genres']:
@@ -490,7 +555,7 @@ def main():
         "Minimum Rating ⭐",
         0.0,
         10.0,
-        7.5,
+        DEFAULT_MIN_RATING,
         0.1
     )
     
@@ -537,6 +602,8 @@ def main():
     Made with ❤️ using Streamlit
     """)
     
+    startup_slot = st.sidebar.empty()
+    
     # ========================= MAIN HEADER =========================
     st.markdown("""
     <div class="main-header">
@@ -623,7 +690,7 @@ def main():
         st.markdown('<div class="section-header">🔥 Popular & Highly Rated Movies</div>', unsafe_allow_html=True)
         st.markdown('<p style="color: rgba(255,255,255,0.7); margin-bottom: 2rem;">Discover some of the highest-rated movies of all time</p>', unsafe_allow_html=True)
         
-        top_movies = movies.nlargest(9, 'rating')
+        top_movies = movies.nlargest(HOME_GRID_SIZE, 'rating')
         
         cols = st.columns(3)
         for idx, (_, movie) in enumerate(top_movies.iterrows()):
@@ -645,6 +712,62 @@ def main():
         <p>Built with ❤️ using Python, Streamlit, and Machine Learning</p>
     </div>
     """, unsafe_allow_html=True)
+    
+    # ========================= STARTUP METRICS =========================
+    # The first session's wait, from the start of its script run to the end of rendering
+    if startup.record_once('time_to_first_response', round(time.perf_counter() - _IMPORT_START, 3)):
+        logger.info("Startup: %s", format_startup_report(startup.startup_snapshot()))
+    
+    startup_slot.caption(f"⚡ {format_startup_report(startup.startup_snapshot())}")
+
+# ========================= COMMAND LINE =========================
+
+def record_import_time():
+    """Record the first import time of this script and warn when it is over budget"""
+    if startup.record_once('import_seconds', round(IMPORT_SECONDS, 3)) and IMPORT_SECONDS > IMPORT_BUDGET_SECONDS:
+        logger.warning("Imports took %.2fs, over the %.1fs budget", IMPORT_SECONDS, IMPORT_BUDGET_SECONDS)
+
+def build_index():
+    """Build the similarity index and poster cache into startup.INDEX_DIR"""
+    movies = load_movie_data()
+    start = time.perf_counter()
+    warmed_posters = warm_up_caches(movies)
+    logger.info(
+        "Built %s and %d posters in %.2fs",
+        startup.similarity_index_path(movies['features']), warmed_posters, time.perf_counter() - start
+    )
+
+def streamlit_port(streamlit_args):
+    """Port the Streamlit server will listen on, from the command line or its config"""
+    for i, arg in enumerate(streamlit_args):
+        if arg.startswith('--server.port='):
+            return int(arg.split('=', 1)[1])
+        if arg == '--server.port' and i + 1 < len(streamlit_args):
+            return int(streamlit_args[i + 1])
+
+    from streamlit import config
+    return int(config.get_option('server.port'))
+
+def serve(streamlit_args):
+    """Warm up in the background, expose the readiness probe, then run the Streamlit server"""
+    from streamlit.web import cli as stcli
+
+    # Report ready only once the app port answers, not just when warm-up is done
+    startup.watch_app(streamlit_port(streamlit_args))
+    startup.serve_readiness(READY_PORT)
+    startup.start_warm_up(warm_up_caches, load_movie_data())
+    sys.argv = ["streamlit", "run", os.path.abspath(__file__), *streamlit_args]
+    sys.exit(stcli.main())
+
+record_import_time()
 
 if __name__ == "__main__":
-    main()
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "build-index":
+        logging.basicConfig(level=logging.INFO)
+        build_index()
+    elif command == "serve":
+        logging.basicConfig(level=logging.INFO)
+        serve(sys.argv[2:])
+    else:
+        main()
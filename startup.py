@@ -0,0 +1,284 @@
+"""Startup support for FilmyX AI: prebuilt similarity index, poster cache, warm-up and readiness.
+
+This module does not import Streamlit, so the launcher, the build step and the app
+share one process-level copy of the state below.
+"""
+import time
+PROCESS_START = time.perf_counter()
+
+import os
+import json
+import hashlib
+import logging
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ========================= CONFIGURATION =========================
+
+# Directory holding the prebuilt index and poster files; bake it into the image or mount it
+INDEX_DIR = os.environ.get(
+    "FILMYX_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".filmyx_index")
+)
+
+# Bump when the index format or the similarity computation changes
+INDEX_VERSION = 1
+
+TFIDF_PARAMS = {
+    'stop_words': 'english',
+    'ngram_range': (1, 2),
+    'max_features': 5000
+}
+
+POSTER_TIMEOUT = 5
+POSTER_WORKERS = 8
+
+# ========================= SIMILARITY INDEX =========================
+
+_indexes = {}
+_index_lock = threading.Lock()
+
+def index_fingerprint(features):
+    """Hash of the index version, TF-IDF parameters and feature text"""
+    digest = hashlib.sha256()
+    digest.update(f"v{INDEX_VERSION}\n".encode('utf-8'))
+    digest.update(json.dumps(TFIDF_PARAMS, sort_keys=True).encode('utf-8'))
+    for text in features:
+        digest.update(b'\n' + text.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def similarity_index_path(features):
+    """Index file path for the given feature text"""
+    return os.path.join(INDEX_DIR, f"similarity_{index_fingerprint(features)}.npy")
+
+def build_similarity_matrix(features):
+    """Fit TF-IDF on movie features and calculate cosine similarity"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    tfidf = TfidfVectorizer(**TFIDF_PARAMS)
+    tfidf_matrix = tfidf.fit_transform(features)
+    return cosine_similarity(tfidf_matrix, tfidf_matrix)
+
+def load_similarity_index(features):
+    """Memory-map the prebuilt index, or return None if it is missing or invalid"""
+    path = similarity_index_path(features)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        cosine_sim = np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable similarity index %s", path)
+        return None
+
+    if cosine_sim.shape != (len(features), len(features)):
+        logger.warning("Ignoring similarity index %s with shape %s", path, cosine_sim.shape)
+        return None
+
+    return cosine_sim
+
+def save_similarity_index(features, cosine_sim):
+    """Atomically write the similarity index and return its path"""
+    path = similarity_index_path(features)
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, cosine_sim)
+    os.replace(tmp_path, path)
+    return path
+
+def get_similarity_matrix(features):
+    """Similarity matrix for the features, from memory, the prebuilt index, or a fresh fit"""
+    features = list(features)
+    fingerprint = index_fingerprint(features)
+
+    with _index_lock:
+        if fingerprint in _indexes:
+            return _indexes[fingerprint]
+
+        cosine_sim = load_similarity_index(features)
+        if cosine_sim is None:
+            logger.info("No prebuilt similarity index for %s, fitting TF-IDF", fingerprint)
+            cosine_sim = build_similarity_matrix(features)
+            try:
+                save_similarity_index(features, cosine_sim)
+            except OSError as e:
+                logger.warning("Could not save similarity index: %s", e)
+
+        _indexes[fingerprint] = cosine_sim
+        return cosine_sim
+
+# ========================= POSTER CACHE =========================
+
+def poster_path(poster_url):
+    """Disk cache path for a poster URL"""
+    name = hashlib.sha256(poster_url.encode('utf-8')).hexdigest()
+    return os.path.join(INDEX_DIR, 'posters', name)
+
+def cached_poster(poster_url):
+    """Poster bytes from the disk cache, or None on a miss; never touches the network"""
+    path = poster_path(poster_url)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+def fetch_poster(poster_url):
+    """Poster bytes from the disk cache, downloading on a miss; network errors are raised"""
+    poster = cached_poster(poster_url)
+    if poster is not None:
+        return poster
+
+    import requests
+
+    response = requests.get(poster_url, timeout=POSTER_TIMEOUT)
+    response.raise_for_status()
+
+    path = poster_path(poster_url)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not cache poster %s: %s", poster_url, e)
+
+    return response.content
+
+def prefetch_posters(poster_urls):
+    """Fetch posters in parallel and return how many succeeded"""
+    def fetch(poster_url):
+        try:
+            fetch_poster(poster_url)
+            return True
+        except Exception as e:
+            logger.warning("Could not prefetch poster %s: %s", poster_url, e)
+            return False
+
+    with ThreadPoolExecutor(max_workers=POSTER_WORKERS) as executor:
+        return sum(executor.map(fetch, sorted(set(poster_urls))))
+
+# ========================= STARTUP STATE =========================
+
+_state = {
+    'status': 'cold',
+    'import_seconds': None,
+    'warm_seconds': None,
+    'warmed_posters': 0,
+    'seconds_to_ready': None,
+    'time_to_first_response': None,
+    'error': None
+}
+_state_lock = threading.Lock()
+_warm_thread = None
+
+# Health URL of the Streamlit server the probe waits for; None when not launched by `serve`
+_app_health_url = None
+
+def startup_snapshot():
+    """Copy of the startup state, safe to serialize"""
+    with _state_lock:
+        return dict(_state, ready=_state['status'] == 'ready')
+
+def record_startup(**values):
+    """Update startup metrics"""
+    with _state_lock:
+        _state.update(values)
+
+def record_once(key, value):
+    """Set a startup metric only if it is still unset; returns True if it was set"""
+    with _state_lock:
+        if _state[key] is not None:
+            return False
+        _state[key] = value
+        return True
+
+def watch_app(port, host='127.0.0.1'):
+    """Make the readiness probe also wait for the Streamlit server on this port"""
+    global _app_health_url
+    _app_health_url = f"http://{host}:{port}/_stcore/health"
+
+def app_is_serving():
+    """True once the watched Streamlit server answers its health check"""
+    if _app_health_url is None:
+        return True
+    try:
+        with urllib.request.urlopen(_app_health_url, timeout=1) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+def readiness():
+    """Startup state for the probe: ready once warm-up is done and the app is serving"""
+    snapshot = startup_snapshot()
+    snapshot['app_serving'] = app_is_serving()
+    snapshot['ready'] = snapshot['ready'] and snapshot['app_serving']
+    if snapshot['ready'] and snapshot['seconds_to_ready'] is None:
+        record_once('seconds_to_ready', round(seconds_since_start(), 3))
+        snapshot['seconds_to_ready'] = startup_snapshot()['seconds_to_ready']
+    return snapshot
+
+def seconds_since_start():
+    """Seconds since this process imported the startup module"""
+    return time.perf_counter() - PROCESS_START
+
+def start_warm_up(warm_up, *args):
+    """Run warm_up(*args) once per process in a background thread"""
+    global _warm_thread
+
+    def run():
+        start = time.perf_counter()
+        try:
+            warmed_posters = warm_up(*args)
+        except Exception as e:
+            logger.exception("Warm-up failed")
+            record_startup(status='failed', error=str(e))
+            return
+        record_startup(
+            status='ready',
+            warm_seconds=round(time.perf_counter() - start, 3),
+            warmed_posters=warmed_posters
+        )
+        logger.info("Warm-up finished: %s", startup_snapshot())
+
+    with _state_lock:
+        if _warm_thread is None:
+            _state['status'] = 'warming'
+            _warm_thread = threading.Thread(target=run, name='filmyx-warm-up', daemon=True)
+            _warm_thread.start()
+        return _warm_thread
+
+# ========================= READINESS PROBE =========================
+
+class ReadinessHandler(BaseHTTPRequestHandler):
+    """Answers GET /ready with the startup state: 200 once warm and serving, 503 before"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/ready':
+            self.send_error(404)
+            return
+
+        snapshot = readiness()
+        body = json.dumps(snapshot).encode('utf-8')
+        self.send_response(200 if snapshot['ready'] else 503)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("Readiness probe: " + format, *args)
+
+def serve_readiness(port, host='0.0.0.0'):
+    """Serve the readiness probe from a daemon thread and return the server"""
+    server = ThreadingHTTPServer((host, port), ReadinessHandler)
+    threading.Thread(target=server.serve_forever, name='filmyx-readiness', daemon=True).start()
+    logger.info("Readiness probe listening on http://%s:%d/ready", host, server.server_address[1])
+    return server
@@ -0,0 +1,177 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+import startup
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FEATURES = [
+    "Drama Crime Frank Darabont Tim Robbins prison redemption",
+    "Crime Drama Francis Ford Coppola Marlon Brando mafia family",
+    "Action Sci-Fi Christopher Nolan Leonardo DiCaprio dreams heist",
+]
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(startup, "INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(startup, "_indexes", {})
+    return tmp_path
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(
+        startup, "_state",
+        dict(startup._state, status="cold", warm_seconds=None, seconds_to_ready=None)
+    )
+    monkeypatch.setattr(startup, "_warm_thread", None)
+    monkeypatch.setattr(startup, "_app_health_url", None)
+
+
+@pytest.fixture
+def probe():
+    server = startup.serve_readiness(0, host="127.0.0.1")
+    url = f"http://127.0.0.1:{server.server_address[1]}/ready"
+
+    def get():
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    yield get
+    server.shutdown()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class HealthHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path == "/_stcore/health" else 404)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def count_builds(monkeypatch):
+    calls = []
+    build = startup.build_similarity_matrix
+
+    def counting_build(features):
+        calls.append(features)
+        return build(features)
+
+    monkeypatch.setattr(startup, "build_similarity_matrix", counting_build)
+    return calls
+
+
+def test_similarity_index_is_built_on_miss_and_mmapped_on_hit(index_dir, monkeypatch):
+    calls = count_builds(monkeypatch)
+
+    built = startup.get_similarity_matrix(FEATURES)
+    assert len(calls) == 1
+    assert os.path.exists(startup.similarity_index_path(FEATURES))
+
+    # A new process only has the file on disk
+    monkeypatch.setattr(startup, "_indexes", {})
+    loaded = startup.get_similarity_matrix(FEATURES)
+    assert len(calls) == 1
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_allclose(loaded, built)
+
+
+def test_similarity_index_with_wrong_shape_is_rebuilt(index_dir, monkeypatch):
+    calls = count_builds(monkeypatch)
+    os.makedirs(startup.INDEX_DIR, exist_ok=True)
+    np.save(startup.similarity_index_path(FEATURES), np.zeros((2, 2)))
+
+    cosine_sim = startup.get_similarity_matrix(FEATURES)
+
+    assert len(calls) == 1
+    assert cosine_sim.shape == (3, 3)
+    assert np.load(startup.similarity_index_path(FEATURES)).shape == (3, 3)
+
+
+def test_index_fingerprint_tracks_tfidf_params(monkeypatch):
+    fingerprint = startup.index_fingerprint(FEATURES)
+    monkeypatch.setitem(startup.TFIDF_PARAMS, "max_features", 100)
+    assert startup.index_fingerprint(FEATURES) != fingerprint
+
+
+def test_readiness_probe_reports_warm_up_progress(fresh_state, probe):
+    release = threading.Event()
+    thread = startup.start_warm_up(lambda: release.wait(5) and 3)
+
+    status, body = probe()
+    assert status == 503
+    assert body["ready"] is False
+
+    release.set()
+    thread.join(5)
+
+    status, body = probe()
+    assert status == 200
+    assert body["ready"] is True
+    assert body["warmed_posters"] == 3
+    assert body["seconds_to_ready"] is not None
+
+
+def test_readiness_probe_waits_for_app_port(fresh_state, probe):
+    port = free_port()
+    startup.watch_app(port)
+    startup.start_warm_up(lambda: 0).join(5)
+
+    status, body = probe()
+    assert status == 503
+    assert body["app_serving"] is False
+    assert body["seconds_to_ready"] is None
+
+    app = ThreadingHTTPServer(("127.0.0.1", port), HealthHandler)
+    threading.Thread(target=app.serve_forever, daemon=True).start()
+    try:
+        status, body = probe()
+        assert status == 200
+        assert body["app_serving"] is True
+    finally:
+        app.shutdown()
+
+
+def test_app_import_is_lazy():
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import main2\n"
+        "print(json.dumps({\n"
+        "    'seconds': time.perf_counter() - start,\n"
+        "    'budget': main2.IMPORT_BUDGET_SECONDS,\n"
+        "    'heavy': [m for m in ('sklearn', 'requests', 'PIL') if m in sys.modules],\n"
+        "}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["heavy"] == []
+    # Timing depends on the machine, so like the app itself only warn about the budget
+    if report["seconds"] > report["budget"]:
+        warnings.warn(f"main2 imported in {report['seconds']:.2f}s, over the {report['budget']:.1f}s budget")